@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count
 from .models import ChatSession, ChatMessage
 
 
@@ -8,10 +9,7 @@ class ChatMessageInline(admin.TabularInline):
     extra = 0
     readonly_fields = ('created_at',)
     fields = ('message_type', 'content', 'generated_sql', 'sql_result', 'created_at')
-    
-    def get_queryset(self, request):
-        """Order messages chronologically within the session."""
-        return super().get_queryset(request).order_by('created_at')
+    ordering = ('created_at',)  # chronological within the session
 
 
 @admin.register(ChatSession)
@@ -38,13 +36,13 @@ class ChatSessionAdmin(admin.ModelAdmin):
     
     def message_count(self, obj):
         """Display the number of messages in the session."""
-        return obj.messages.count()
+        return obj._message_count
     message_count.short_description = 'Messages'
-    message_count.admin_order_field = 'messages__count'
+    message_count.admin_order_field = '_message_count'
     
     def get_queryset(self, request):
-        """Optimize queries by prefetching related data."""
-        return super().get_queryset(request).select_related('user').prefetch_related('messages')
+        """Optimize queries by annotating the message count in a single query."""
+        return super().get_queryset(request).select_related('user').annotate(_message_count=Count('messages'))
 
 
 @admin.register(ChatMessage)
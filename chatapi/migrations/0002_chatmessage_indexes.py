@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatapi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['session', '-created_at'], name='chatapi_cha_session_3ad268_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['message_type'], name='chatapi_cha_message_bbbe4f_idx'),
+        ),
+    ]
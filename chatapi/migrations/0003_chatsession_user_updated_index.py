@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatapi', '0002_chatmessage_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatsession',
+            index=models.Index(fields=['user', '-updated_at'], name='chatapi_cha_user_id_2dba83_idx'),
+        ),
+    ]
@@ -1,6 +1,5 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.utils import timezone
 import uuid
 
 
@@ -14,6 +13,9 @@ class ChatSession(models.Model):
     
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['user', '-updated_at']),
+        ]
     
     def __str__(self):
         return f"Chat {self.id} - {self.user.username} - {self.title or 'No Title'}"
@@ -39,12 +41,10 @@ class ChatMessage(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['session', '-created_at']),
+            models.Index(fields=['message_type']),
+        ]
     
     def __str__(self):
         return f"{self.message_type}: {self.content[:50]}..."
-    
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update session timestamp
-        self.session.updated_at = timezone.now()
-        self.session.save(update_fields=['updated_at'])
\ No newline at end of file
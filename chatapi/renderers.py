@@ -0,0 +1,27 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def format_event(data) -> str:
+    """Format a payload as a single Server-Sent Events message."""
+    return f"data: {json.dumps(data, cls=JSONEncoder)}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer for clients that ask for ``text/event-stream``.
+
+    Streaming views return a ``StreamingHttpResponse`` themselves; this
+    renderer lets content negotiation accept the media type and renders
+    ordinary responses (e.g. validation errors) as a single event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return format_event(data).encode(self.charset)
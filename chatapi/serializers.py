@@ -1,6 +1,6 @@
 # serializers.py
 from rest_framework import serializers
-from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
+from drf_spectacular.utils import extend_schema_serializer, extend_schema_field, OpenApiExample
 from .models import ChatSession, ChatMessage
 
 
@@ -15,6 +15,10 @@ class ChatMessageSerializer(serializers.ModelSerializer):
 
 class ChatSessionSerializer(serializers.ModelSerializer):
     """Serializer for chat sessions."""
+    # List views should annotate _messages_count and prefetch the latest message
+    # into _prefetched_last (see ChatSessionListView.get_queryset); without them
+    # each session falls back to two extra queries. Kept out of the docstring,
+    # which drf-spectacular publishes as the schema description.
     messages_count = serializers.SerializerMethodField()
     last_message = serializers.SerializerMethodField()
     
@@ -25,11 +29,16 @@ class ChatSessionSerializer(serializers.ModelSerializer):
     
     def get_messages_count(self, obj):
         """Get total number of messages in this session."""
+        if hasattr(obj, '_messages_count'):
+            return obj._messages_count
         return obj.messages.count()
     
     def get_last_message(self, obj):
         """Get the most recent message content."""
-        last_msg = obj.messages.first()
+        if hasattr(obj, '_prefetched_last'):
+            last_msg = obj._prefetched_last[0] if obj._prefetched_last else None
+        else:
+            last_msg = obj.messages.first()
         if last_msg:
             return {
                 'content': last_msg.content[:100] + '...' if len(last_msg.content) > 100 else last_msg.content,
@@ -40,13 +49,20 @@ class ChatSessionSerializer(serializers.ModelSerializer):
 
 
 class ChatSessionDetailSerializer(serializers.ModelSerializer):
-    """Detailed serializer for chat sessions with messages."""
-    messages = ChatMessageSerializer(many=True, read_only=True)
+    """Detailed serializer for chat sessions with messages (the newest ``max_messages``)."""
+    messages = serializers.SerializerMethodField()
+    max_messages = 200
     
     class Meta:
         model = ChatSession
         fields = ['id', 'title', 'created_at', 'updated_at', 'messages']
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    @extend_schema_field(ChatMessageSerializer(many=True))
+    def get_messages(self, obj):
+        """Get the session's messages as plain rows, skipping per-message serializer overhead."""
+        messages = obj.messages.order_by('-created_at').values(*ChatMessageSerializer.Meta.fields)
+        return list(messages[:self.max_messages])
 
 
 class CreateChatSerializer(serializers.ModelSerializer):
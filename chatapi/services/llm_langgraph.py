@@ -38,7 +38,16 @@ class SQLQuerySystem:
         """
         self.db = self._init_database(db_uri)
         self.llm = self._init_llm()
+        self._structured_llm = self.llm.with_structured_output(QueryOutput)
         self.query_tool = QuerySQLDatabaseTool(db=self.db)
+        
+        # Schema introspection and prompt templates don't change between
+        # questions, so build them once instead of on every call.
+        self._dialect = self.db.dialect
+        self._table_info = self.db.get_table_info()
+        self._query_template = self._get_query_prompt_template()
+        self._answer_template = self._get_answer_prompt_template()
+        
         self.graph = self._build_graph()
     
     def _init_database(self, db_uri: str) -> SQLDatabase:
@@ -46,7 +55,7 @@ class SQLQuerySystem:
         try:
             return SQLDatabase.from_uri(db_uri)
         except Exception as e:
-            logger.error(f"Failed to initialize database: {e}")
+            logger.error("Failed to initialize database: %s", e)
             raise
     
     def _init_llm(self):
@@ -58,7 +67,7 @@ class SQLQuerySystem:
                 api_key=settings.ANTHROPIC_API_KEY
             )
         except Exception as e:
-            logger.error(f"Failed to initialize LLM: {e}")
+            logger.error("Failed to initialize LLM: %s", e)
             raise
     
     def _get_query_prompt_template(self) -> ChatPromptTemplate:
@@ -91,22 +100,20 @@ class SQLQuerySystem:
             Dictionary with generated query
         """
         try:
-            prompt_template = self._get_query_prompt_template()
-            prompt = prompt_template.invoke({
-                "dialect": self.db.dialect,
+            prompt = self._query_template.invoke({
+                "dialect": self._dialect,
                 "top_k": getattr(config, 'TOP_K', 10),
-                "table_info": self.db.get_table_info(),
+                "table_info": self._table_info,
                 "input": state["question"],
             })
             
-            structured_llm = self.llm.with_structured_output(QueryOutput)
-            result = structured_llm.invoke(prompt)
+            result = self._structured_llm.invoke(prompt)
             
-            logger.info(f"Generated SQL query: {result['query']}")
+            logger.info("Generated SQL query: %s", result['query'])
             return {"query": result["query"]}
             
         except Exception as e:
-            logger.error(f"Error generating SQL query: {e}")
+            logger.error("Error generating SQL query: %s", e)
             return {"query": "SELECT 1;"}  # Fallback query
     
     def execute_query(self, state: State) -> Dict[str, str]:
@@ -120,11 +127,13 @@ class SQLQuerySystem:
         """
         try:
             result = self.query_tool.invoke(state["query"])
-            logger.info(f"Query executed successfully, result length: {len(str(result))}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Query executed successfully, result length: %d",
+                            len(result) if isinstance(result, str) else len(str(result)))
             return {"sql_result": result}
             
         except Exception as e:
-            logger.error(f"Error executing SQL query: {e}")
+            logger.error("Error executing SQL query: %s", e)
             return {"sql_result": f"Error executing query: {str(e)}"}
     
     def generate_answer(self, state: State) -> Dict[str, str]:
@@ -137,8 +146,7 @@ class SQLQuerySystem:
             Dictionary with generated answer
         """
         try:
-            prompt_template = self._get_answer_prompt_template()
-            prompt = prompt_template.invoke({
+            prompt = self._answer_template.invoke({
                 "input": state["question"],
                 "query": state["query"],
                 "sql_result": state["sql_result"],
@@ -149,7 +157,7 @@ class SQLQuerySystem:
             return {"answer": response.content}
             
         except Exception as e:
-            logger.error(f"Error generating answer: {e}")
+            logger.error("Error generating answer: %s", e)
             return {"answer": "I apologize, but I encountered an error while generating the answer."}
     
     def _build_graph(self) -> Any:
@@ -163,7 +171,7 @@ class SQLQuerySystem:
         graph_builder.add_edge(START, "write_query")
         return graph_builder.compile()
     
-    def query(self, question: str, stream: bool = False) -> Dict[str, Any]:
+    def query(self, question: str, stream: bool = False) -> Any:
         """Process a natural language question and return SQL results.
         
         Args:
@@ -171,17 +179,15 @@ class SQLQuerySystem:
             stream: Whether to stream intermediate results
             
         Returns:
-            Final state with question, query, sql_result, and answer
+            Final state with question, query, sql_result, and answer, or when
+            streaming, a generator yielding the accumulated state after each
+            workflow step (the last one carries the answer)
         """
-        logger.info(f"Processing question: {question}")
+        logger.info("Processing question: %s", question)
         
         initial_state = {"question": question}
         
         if stream:
-            final_state = None
-            for step in self.graph.stream(initial_state, stream_mode="updates"):
-                logger.debug(f"Workflow step: {step}")
-                final_state = step
-            return final_state
+            return self.graph.stream(initial_state, stream_mode="values")
         else:
-            return self.graph.invoke(initial_state)
\ No newline at end of file
+            return self.graph.invoke(initial_state)
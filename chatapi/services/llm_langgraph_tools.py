@@ -1,4 +1,5 @@
-from typing import Dict, Any, List, Union, Optional
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple, Union
 from typing_extensions import TypedDict, Annotated
 from abc import ABC, abstractmethod
 
@@ -8,10 +9,13 @@ from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, Tool
 from langchain_community.tools.sql_database.tool import QuerySQLDatabaseTool
 from langgraph.graph import START, StateGraph
 from django.conf import settings
+from django.dispatch import receiver
 from constance import config
+from constance.signals import config_updated
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_core.tools import tool
+from langchain_anthropic import convert_to_anthropic_tool
 from langgraph.runtime import Runtime
 
 import logging
@@ -31,6 +35,8 @@ class ContextSchema(TypedDict):
 class MessageProcessor(ABC):
     """Abstract base class for message processors."""
     
+    __slots__ = ()
+    
     @abstractmethod
     def process_messages(self, messages: Dict[str, Any]) -> Any:
         """Process messages and return relevant data."""
@@ -59,6 +65,7 @@ class SQLQuerySystemTools:
         self._setup_database()
         self._setup_llm()
         self._setup_graph()
+        self._default_system_message = self._make_system_message(self.system_prompt)
 
     def _setup_database(self):
         """Setup the database connection and SQL query tool."""
@@ -94,17 +101,27 @@ class SQLQuerySystemTools:
         @tool(description=self.tool_description)
         def sql_db_query(query: str) -> str:
             """Execute a SQL query against the database."""
-            query_tool = QuerySQLDatabaseTool(db=self.db)
             try:
-                result = query_tool.invoke(query)
-                self.logger.info(f"Query executed successfully, result length: {len(str(result))}")
+                result = self.sql_query_tool.invoke(query)
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Query executed successfully, result length: %d",
+                                     len(result) if isinstance(result, str) else len(str(result)))
                 return result
             except Exception as e:
-                self.logger.error(f"Error executing SQL query: {e}")
+                self.logger.error("Error executing SQL query: %s", e)
                 return f"Error executing SQL query: {e}"
         
         self.sql_db_query = sql_db_query
-        self.llm_with_tools = self.llm.bind_tools([sql_db_query])
+        
+        # Anthropic prompt caching: the tool definition (which embeds the table
+        # schema) and the system prompt are marked as cacheable prefixes
+        self._prompt_caching = config.LLM_PROVIDER == "anthropic"
+        if self._prompt_caching:
+            cached_tool = convert_to_anthropic_tool(sql_db_query)
+            cached_tool["cache_control"] = {"type": "ephemeral"}
+            self.llm_with_tools = self.llm.bind_tools([cached_tool])
+        else:
+            self.llm_with_tools = self.llm.bind_tools([sql_db_query])
     
     def _setup_graph(self):
         """Setup the LangGraph workflow."""
@@ -124,27 +141,89 @@ class SQLQuerySystemTools:
         
         self.graph = self.graph_builder.compile()
     
-    def query(self, messages: list, custom_system_prompt: str = None) -> Dict[str, Any]:
+    def _make_system_message(self, prompt: str, system_context: str = None) -> SystemMessage:
+        """Build a system message, marked for provider prompt caching when enabled.
+        
+        Only the static prompt is marked as a cached prefix; system_context
+        (per-chat data such as user filters) goes in a separate, uncached
+        block after it so changing it doesn't invalidate the cache.
+        """
+        if self._prompt_caching:
+            content = [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
+            if system_context:
+                content.append({"type": "text", "text": system_context})
+            return SystemMessage(content=content)
+        return SystemMessage(content=prompt + system_context if system_context else prompt)
+
+    def _get_system_message(self, custom_system_prompt: str = None,
+                            system_context: str = None) -> SystemMessage:
+        """Get the system message for a call, reusing the default one when possible."""
+        if custom_system_prompt or system_context:
+            return self._make_system_message(custom_system_prompt or self.system_prompt, system_context)
+        return self._default_system_message
+
+    def query(self, messages: list, custom_system_prompt: str = None,
+              system_context: str = None) -> Dict[str, Any]:
         """
         Execute a query using the LLM with SQL tools.
         
         Args:
             message: The user's query/message
             custom_system_prompt: Optional custom system prompt for this query
+            system_context: Optional per-request text appended after the (cached) system prompt
             
         Returns:
             Dictionary containing the conversation state with messages
         """
-        system_prompt = custom_system_prompt or self.system_prompt
-        
         state = self.graph.invoke(
-            {"messages": messages}, 
-            context={"system_prompt": SystemMessage(content=system_prompt)}
+            {"messages": messages},
+            context={"system_prompt": self._get_system_message(custom_system_prompt, system_context)}
         )
         return state
 
+    def stream(self, messages: list, custom_system_prompt: str = None,
+               system_context: str = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Execute a query and stream its progress.
+        
+        Args:
+            messages: The user's query/messages
+            custom_system_prompt: Optional custom system prompt for this query
+            system_context: Optional per-request text appended after the (cached) system prompt
+            
+        Returns:
+            Generator of (mode, chunk) pairs: "messages" chunks are
+            (message_chunk, metadata) tuples with LLM tokens as they are
+            generated, "values" chunks are the full conversation state after
+            each step (the last one matches what query() returns)
+        """
+        return self.graph.stream(
+            {"messages": messages},
+            context={"system_prompt": self._get_system_message(custom_system_prompt, system_context)},
+            stream_mode=["messages", "values"]
+        )
+
+    def astream(self, messages: list, custom_system_prompt: str = None,
+                system_context: str = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Async version of stream(); the sync graph nodes run in a thread pool.
+        
+        Args:
+            messages: The user's query/messages
+            custom_system_prompt: Optional custom system prompt for this query
+            system_context: Optional per-request text appended after the (cached) system prompt
+            
+        Returns:
+            Async generator of (mode, chunk) pairs, as yielded by stream()
+        """
+        return self.graph.astream(
+            {"messages": messages},
+            context={"system_prompt": self._get_system_message(custom_system_prompt, system_context)},
+            stream_mode=["messages", "values"]
+        )
+
     def query_and_process(self, messages: list, processor: MessageProcessor, 
-                         custom_system_prompt: str = None) -> Any:
+                         custom_system_prompt: str = None, system_context: str = None) -> Any:
         """
         Execute a query and process the results using the provided processor.
         
@@ -152,19 +231,56 @@ class SQLQuerySystemTools:
             messages: The user's query/messages
             processor: MessageProcessor instance to process the results
             custom_system_prompt: Optional custom system prompt
+            system_context: Optional per-request text appended after the (cached) system prompt
             
         Returns:
             Processed results from the processor
         """
-        result = self.query(messages, custom_system_prompt)
+        result = self.query(messages, custom_system_prompt, system_context)
         return processor.process_messages(result)
 
 
+@lru_cache(maxsize=4)
+def get_sql_query_system_tools(db_path: str = "./db.sqlite3") -> SQLQuerySystemTools:
+    """Get the process-wide SQLQuerySystemTools for a database, building it on first use."""
+    return SQLQuerySystemTools(db_path)
+
+
+@lru_cache(maxsize=1)
+def get_system_prompt_with_filters() -> Tuple[str, str]:
+    """Get the LLM_SYSTEM_PROMPT_WITH_TOOLS_AND_FILTERS template without a constance lookup per request.
+    
+    Returns (static prompt, filters suffix) split at the ``{user_filters}``
+    placeholder: the static part can be cached by the provider, the suffix is
+    formatted per chat. Without a placeholder the filters go at the end.
+    The static part is formatted here, so ``{{``/``}}`` escapes in it become
+    single braces as they do in the suffix.
+    """
+    prompt, _, suffix = config.LLM_SYSTEM_PROMPT_WITH_TOOLS_AND_FILTERS.partition('{user_filters}')
+    return prompt.format(), '{user_filters}' + suffix
+
+
+@receiver(config_updated)
+def _clear_sql_query_system_tools_cache(sender, **kwargs):
+    """Rebuild systems on next use so they pick up changed LLM settings and prompts.
+    
+    config_updated is only sent in the process that saved the change: other
+    workers keep the cached model settings and prompts until they restart.
+    """
+    get_sql_query_system_tools.cache_clear()
+    get_system_prompt_with_filters.cache_clear()
+
+
 class ProcessedMessages(MessageProcessor):
     """
     A class to process and extract information from conversation messages.
     """
     
+    __slots__ = (
+        'messages', '_sql_queries', '_human_messages', '_ai_messages',
+        '_system_messages', '_tool_messages', '_summary',
+    )
+    
     def __init__(self, messages: Optional[Dict[str, Any]] = None):
         """
         Initialize ProcessedMessages.
@@ -173,13 +289,7 @@ class ProcessedMessages(MessageProcessor):
             messages: Optional messages dictionary to process immediately
         """
         self.messages = messages
-        self._sql_queries = None
-        self._human_messages = None
-        self._ai_messages = None
-        self._system_messages = None
-        
-        if messages:
-            self._process_all()
+        self._process_all()
 
     def process_messages(self, messages: Dict[str, Any]) -> 'ProcessedMessages':
         """
@@ -196,139 +306,130 @@ class ProcessedMessages(MessageProcessor):
         return self
 
     def _process_all(self):
-        """Process all message types and cache results."""
-        if not self.messages:
-            return
-            
-        self._sql_queries = self._extract_sql_queries()
-        self._human_messages = self._get_messages_by_type(HumanMessage)
-        self._ai_messages = self._get_messages_by_type(AIMessage)
-        self._system_messages = self._get_messages_by_type(SystemMessage)
-        self._tool_messages = self._get_messages_by_type(ToolMessage)
-
-    def _extract_sql_queries(self) -> List[str]:
-        """Extract SQL queries from the messages with improved error handling."""
-        if not self.messages or 'messages' not in self.messages:
-            return []
-            
-        sql_queries = []
+        """Sort all messages by type and extract SQL queries in a single pass."""
+        self._sql_queries = []
+        self._human_messages = []
+        self._ai_messages = []
+        self._system_messages = []
+        self._tool_messages = []
+        messages = self.messages.get('messages', []) if self.messages else []
+        
+        by_type = {
+            HumanMessage: self._human_messages,
+            AIMessage: self._ai_messages,
+            SystemMessage: self._system_messages,
+            ToolMessage: self._tool_messages,
+        }
         
         try:
-            for message in self.messages['messages']:
-                if isinstance(message, AIMessage):
-                    # Handle different content structures
-                    if hasattr(message, 'content'):
-                        content = message.content
-                        
-                        # If content is a list, iterate through it
-                        if isinstance(content, list):
-                            for item in content:
-                                if isinstance(item, dict) and 'input' in item:
-                                    if isinstance(item['input'], dict) and 'query' in item['input']:
-                                        sql_queries.append(item['input']['query'])
-                        
-                        # Handle tool calls in message
-                        if hasattr(message, 'tool_calls') and message.tool_calls:
-                            for tool_call in message.tool_calls:
-                                if hasattr(tool_call, 'args') and isinstance(tool_call.args, dict):
-                                    if 'query' in tool_call.args:
-                                        sql_queries.append(tool_call.args['query'])
-                                        
+            for message in messages:
+                message_type = type(message)
+                if message_type not in by_type:
+                    # Subclasses (e.g. AIMessageChunk) fall back to isinstance
+                    message_type = next((t for t in by_type if isinstance(message, t)), None)
+                    if message_type is None:
+                        continue
+                by_type[message_type].append(message.content)
+                if message_type is AIMessage:
+                    self._sql_queries.extend(self._extract_sql_queries(message))
         except Exception as e:
-            logger.error(f"Error extracting SQL queries: {e}")
-            
-        return sql_queries
+            logger.error("Error processing messages: %s", e)
+        
+        self._summary = {
+            'total_messages': len(messages),
+            'sql_queries_count': len(self._sql_queries),
+            'human_messages_count': len(self._human_messages),
+            'ai_messages_count': len(self._ai_messages),
+            'system_messages_count': len(self._system_messages),
+            'sql_queries': self._sql_queries,
+        }
 
-    def _get_messages_by_type(self, message_type: Union[HumanMessage, SystemMessage, AIMessage]) -> List[str]:
-        """Get messages of a specific type from the conversation with error handling."""
-        if not self.messages or 'messages' not in self.messages:
-            return []
-            
-        filtered_messages = []
+    def _extract_sql_queries(self, message: AIMessage) -> List[str]:
+        """Extract SQL queries from an AI message's tool calls.
         
-        try:
-            for message in self.messages['messages']:
-                if isinstance(message, message_type):
-                    filtered_messages.append(message.content)
-        except Exception as e:
-            logger.error(f"Error filtering messages by type {message_type.__name__}: {e}")
-            
-        return filtered_messages
+        Falls back to the raw content blocks when the message has no parsed
+        tool calls.
+        """
+        if message.tool_calls:
+            tool_args = (tool_call['args'] for tool_call in message.tool_calls)
+        elif isinstance(message.content, list):
+            tool_args = (item.get('input') for item in message.content if isinstance(item, dict))
+        else:
+            return []
+        return [args['query'] for args in tool_args if isinstance(args, dict) and 'query' in args]
 
     @property
     def sql_queries(self) -> List[str]:
-        """Get extracted SQL queries (cached)."""
-        if self._sql_queries is None:
-            self._sql_queries = self._extract_sql_queries()
+        """Get extracted SQL queries."""
         return self._sql_queries
 
     @property
     def human_messages(self) -> List[str]:
-        """Get human messages (cached)."""
-        if self._human_messages is None:
-            self._human_messages = self._get_messages_by_type(HumanMessage)
+        """Get human messages."""
         return self._human_messages
 
     @property
     def ai_messages(self) -> List[str]:
-        """Get AI messages (cached)."""
-        if self._ai_messages is None:
-            self._ai_messages = self._get_messages_by_type(AIMessage)
+        """Get AI messages."""
         return self._ai_messages
 
     @property
     def system_messages(self) -> List[str]:
-        """Get system messages (cached)."""
-        if self._system_messages is None:
-            self._system_messages = self._get_messages_by_type(SystemMessage)
+        """Get system messages."""
         return self._system_messages
     
     @property
     def tool_messages(self) -> List[str]:
-        """Get tool messages (cached)."""
-        if self._tool_messages is None:
-            self._tool_messages = self._get_messages_by_type(ToolMessage)
+        """Get tool messages."""
         return self._tool_messages
 
     def get_summary(self) -> Dict[str, Any]:
-        """Get a summary of all processed message data."""
-        return {
-            'total_messages': len(self.messages.get('messages', [])) if self.messages else 0,
-            'sql_queries_count': len(self.sql_queries),
-            'human_messages_count': len(self.human_messages),
-            'ai_messages_count': len(self.ai_messages),
-            'system_messages_count': len(self.system_messages),
-            'sql_queries': self.sql_queries,
-        }
+        """Get a summary of all processed message data (computed during processing)."""
+        return self._summary
+
 
+_ROLE_TO_MESSAGE = {'user': HumanMessage}
 
-def convert_queryset_to_langchain(messages_queryset) -> List[Union[HumanMessage, AIMessage]]:
+
+def convert_queryset_to_langchain(messages_queryset, limit: Optional[int] = None) -> List[Union[HumanMessage, AIMessage]]:
     """
     Convert Django QuerySet of ChatMessage objects to LangChain message objects.
     
+    Only the 'message_type' and 'content' columns are fetched; no model
+    instances are built.
+    
     Args:
         messages_queryset: Django QuerySet of ChatMessage objects with 'message_type' and 'content' fields
+        limit: Optional number of most recent messages to keep; applied in the database
         
     Returns:
-        List of LangChain message objects (HumanMessage, AIMessage)
+        List of LangChain message objects (HumanMessage, AIMessage), oldest first
     """
-    langchain_messages = []
-    
-    for message in messages_queryset:
-        if message.message_type == 'user':
-            langchain_messages.append(HumanMessage(content=message.content))
-        else:  # assistant
-            langchain_messages.append(AIMessage(content=message.content))
-    
-    return langchain_messages
+    rows = messages_queryset.values_list('message_type', 'content')
+    if limit is None:
+        rows = rows.order_by('created_at')
+    else:
+        rows = reversed(rows.order_by('-created_at')[:limit])
+    return [
+        _ROLE_TO_MESSAGE.get(message_type, AIMessage)(content=content)
+        for message_type, content in rows
+    ]
 
 
-def get_user_filters(messages_queryset) -> List[tuple]:
+def get_user_filters(messages_queryset, limit: Optional[int] = None) -> List[tuple]:
     """
     Get user filters from the conversation history.
+    
+    Returns (generated_sql, sql_result) tuples for assistant messages that ran
+    a query, oldest first; the filtering and the optional limit to the most
+    recent ones happen in the database.
     """
-    filters = []
-    for message in messages_queryset:
-        if message.message_type == 'assistant' and message.generated_sql:
-            filters.append((message.generated_sql, message.sql_result))
-    return filters
\ No newline at end of file
+    rows = (
+        messages_queryset
+        .filter(message_type='assistant')
+        .exclude(generated_sql='')
+        .values_list('generated_sql', 'sql_result')
+    )
+    if limit is None:
+        return list(rows.order_by('created_at'))
+    return list(reversed(rows.order_by('-created_at')[:limit]))
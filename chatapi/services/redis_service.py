@@ -1,25 +1,49 @@
 import json
 import redis
+from functools import lru_cache
 from django.conf import settings
-from typing import Optional, Dict, Any
+from django.core.exceptions import ImproperlyConfigured
+from typing import Optional, Dict, Any, Callable, Tuple
 from datetime import datetime, timedelta
 
 
+def _get_serializer(name: str) -> Tuple[Callable[[Any], Any], Callable[[Any], Any]]:
+    """Return the (dumps, loads) pair for the REDIS_SERIALIZER setting."""
+    if name == "orjson":
+        import orjson
+        return orjson.dumps, orjson.loads
+    if name == "json":
+        return json.dumps, json.loads
+    raise ImproperlyConfigured(f"REDIS_SERIALIZER must be 'orjson' or 'json', not {name!r}.")
+
+
+# Same default as settings.REDIS_SERIALIZER. json and orjson write the same JSON
+# bytes, so cached entries stay readable when switching between them.
+DEFAULT_SERIALIZER = "orjson"
+
+_dumps, _loads = _get_serializer(getattr(settings, "REDIS_SERIALIZER", DEFAULT_SERIALIZER))
+
+# Shared by all RedisService instances so sockets are reused across requests.
+# redis-py parses replies with hiredis (the redis[hiredis] extra) when it is installed
+_connection_pool = redis.ConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=getattr(settings, "REDIS_DB", 0),
+    max_connections=getattr(settings, "REDIS_MAX_CONNECTIONS", 50),
+)
+
+
 class RedisService:
     def __init__(self):
-        self.client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=getattr(settings, "REDIS_DB", 0),
-            decode_responses=True
-        )
+        # Replies stay as bytes; the serializer decodes payloads itself
+        self.client = redis.Redis(connection_pool=_connection_pool)
         self.default_ttl = 3600  # 1 hour
     
     def get_chat_context(self, chat_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve chat context and filters"""
         key = f"chat:{chat_id}:context"
         data = self.client.get(key)
-        return json.loads(data) if data else None
+        return _loads(data) if data else None
     
     def set_chat_context(self, chat_id: str, context: Dict[str, Any], ttl: int = None):
         """Store chat context and filters"""
@@ -27,7 +51,7 @@ class RedisService:
         self.client.setex(
             key,
             ttl or self.default_ttl,
-            json.dumps(context)
+            _dumps(context)
         )
     
     def append_message(self, chat_id: str, message: str, response: Dict):
@@ -38,19 +62,28 @@ class RedisService:
             "response": response,
             "timestamp": datetime.now().isoformat()
         }
-        self.client.lpush(key, json.dumps(data))
-        self.client.ltrim(key, 0, 9)  # Keep last 10 messages
-        self.client.expire(key, self.default_ttl)
+        # Send all three commands in one round-trip
+        pipe = self.client.pipeline(transaction=False)
+        pipe.lpush(key, _dumps(data))
+        pipe.ltrim(key, 0, 9)  # Keep last 10 messages
+        pipe.expire(key, self.default_ttl)
+        pipe.execute()
     
     def get_cached_response(self, cache_key: str) -> Optional[Dict]:
         """Get cached response"""
         data = self.client.get(f"cache:{cache_key}")
-        return json.loads(data) if data else None
+        return _loads(data) if data else None
     
     def set_cached_response(self, cache_key: str, response: Dict, ttl: int = 300):
         """Cache response for 5 minutes by default"""
         self.client.setex(
             f"cache:{cache_key}",
             ttl,
-            json.dumps(response)
-        )
\ No newline at end of file
+            _dumps(response)
+        )
+
+
+@lru_cache(maxsize=1)
+def get_redis_service() -> RedisService:
+    """Get the process-wide RedisService instance."""
+    return RedisService()
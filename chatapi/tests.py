@@ -1,3 +1,268 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from constance.test import override_config
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import AsyncClient, TestCase
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from redis import RedisError
+from rest_framework.test import APIClient
+
+from .models import ChatMessage, ChatSession
+from .serializers import ChatSessionDetailSerializer
+from .services.llm_langgraph_tools import get_system_prompt_with_filters
+from .services.redis_service import _get_serializer
+from .views import ProcessChatMessageView
+
+
+class CacheKeyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice')
+        cls.bob = User.objects.create_user('bob')
+
+    def setUp(self):
+        self.view = ProcessChatMessageView()
+        self.history = [HumanMessage(content='phones?'), AIMessage(content='We have iPhone.')]
+        self.filters = [('SELECT name FROM products_product', "[('iPhone',)]")]
+
+    def key(self, user=None, message='Cheaper ones?', history=None, filters=None):
+        return self.view._get_cache_key(user or self.alice, message,
+                                        self.history if history is None else history,
+                                        self.filters if filters is None else filters)
+
+    def test_normalizes_message(self):
+        self.assertEqual(self.key(message='Cheaper ones?'), self.key(message='  cheaper   ONES? '))
+
+    def test_depends_on_user(self):
+        self.assertNotEqual(self.key(user=self.alice), self.key(user=self.bob))
+
+    def test_depends_on_filters(self):
+        self.assertNotEqual(self.key(), self.key(filters=[]))
+
+    def test_depends_on_recent_history(self):
+        self.assertNotEqual(self.key(), self.key(history=self.history[:1]))
+
+
+class RedisSerializerTests(TestCase):
+    def test_round_trips(self):
+        for name in ('orjson', 'json'):
+            with self.subTest(name=name):
+                dumps, loads = _get_serializer(name)
+                self.assertEqual(loads(dumps({'answer': 'ok'})), {'answer': 'ok'})
+
+    def test_rejects_unknown_name(self):
+        for name in ('msgpack', 'ORJSON', ''):
+            with self.subTest(name=name), self.assertRaises(ImproperlyConfigured):
+                _get_serializer(name)
+
+
+class SystemPromptTests(TestCase):
+    def setUp(self):
+        get_system_prompt_with_filters.cache_clear()
+        self.addCleanup(get_system_prompt_with_filters.cache_clear)
+
+    @override_config(LLM_SYSTEM_PROMPT_WITH_TOOLS_AND_FILTERS='Answer as {{"answer": ...}}.\nFilters: {user_filters} {{}}')
+    def test_splits_at_filters_and_unescapes_braces(self):
+        prompt, filters_template = get_system_prompt_with_filters()
+        self.assertEqual(prompt, 'Answer as {"answer": ...}.\nFilters: ')
+        self.assertEqual(filters_template.format(user_filters='[]'), '[] {}')
+
+    @override_config(LLM_SYSTEM_PROMPT_WITH_TOOLS_AND_FILTERS='Use {{braces}}.')
+    def test_appends_filters_without_placeholder(self):
+        prompt, filters_template = get_system_prompt_with_filters()
+        self.assertEqual(prompt, 'Use {braces}.')
+        self.assertEqual(filters_template.format(user_filters='[]'), '[]')
+
+
+def fake_final_state(messages, sql_result="[('iPhone',)]"):
+    """A LangGraph final state: one SQL tool call, its result, then the answer."""
+    query = 'SELECT name FROM products_product'
+    return {'messages': list(messages) + [
+        AIMessage(content='', tool_calls=[{'name': 'sql_db_query', 'args': {'query': query}, 'id': 't1'}]),
+        ToolMessage(content=sql_result, tool_call_id='t1'),
+        AIMessage(content='We have iPhone.'),
+    ]}
+
+
+class FakeLLMSystem:
+    """Stands in for SQLQuerySystemTools, recording the messages of each run."""
+
+    def __init__(self, sql_result="[('iPhone',)]"):
+        self.sql_result = sql_result
+        self.calls = []
+
+    def query_and_process(self, messages, processor, custom_system_prompt=None, system_context=None):
+        self.calls.append((messages, system_context))
+        return processor.process_messages(fake_final_state(messages, self.sql_result))
+
+    def stream(self, messages, custom_system_prompt=None, system_context=None):
+        self.calls.append((messages, system_context))
+        yield 'messages', (AIMessageChunk(content='We have '), {'langgraph_node': 'chatbot'})
+        yield 'messages', (AIMessageChunk(content="[('iPhone',)]"), {'langgraph_node': 'tools'})
+        yield 'messages', (AIMessageChunk(content='iPhone.'), {'langgraph_node': 'chatbot'})
+        yield 'values', fake_final_state(messages, self.sql_result)
+
+    async def astream(self, messages, custom_system_prompt=None, system_context=None):
+        for item in self.stream(messages, custom_system_prompt, system_context):
+            yield item
+
+
+class FakeRedisService:
+    """In-memory response cache."""
+
+    def __init__(self):
+        self.cache = {}
+
+    def get_cached_response(self, cache_key):
+        return self.cache.get(cache_key)
+
+    def set_cached_response(self, cache_key, response, ttl=None):
+        self.cache[cache_key] = response
+
+
+class UnavailableRedisService:
+    def get_cached_response(self, cache_key):
+        raise RedisError('Connection refused')
+
+    def set_cached_response(self, cache_key, response, ttl=None):
+        raise RedisError('Connection refused')
+
+
+class ProcessChatMessageTests(TestCase):
+    url = reverse_lazy('chat-process')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='secret')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.llm = FakeLLMSystem()
+        self.redis = FakeRedisService()
+        for target, value in (('get_sql_query_system_tools', self.llm), ('get_redis_service', self.redis)):
+            patcher = mock.patch(f'chatapi.views.{target}', return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def post(self, message='Which phones do you have?', **kwargs):
+        return self.client.post(self.url, {'message': message, **kwargs}, format='json')
+
+    def test_saves_turn_and_titles_new_chat(self):
+        response = self.post('Which phones do you have in stock right now, sorted by price?')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['created_new_chat'])
+        self.assertEqual(response.data['answer'], 'We have iPhone.')
+        session = ChatSession.objects.get(pk=response.data['chat_id'])
+        self.assertEqual(session.title, 'Which phones do you have in stock right now, sorte...')
+        assistant_m, user_m = session.messages.order_by('message_type')
+        self.assertEqual(assistant_m.generated_sql, 'SELECT name FROM products_product')
+        self.assertEqual(assistant_m.sql_result, "[('iPhone',)]")
+        self.assertEqual(user_m.content, 'Which phones do you have in stock right now, sorted by price?')
+
+    def test_caps_stored_sql_result(self):
+        self.llm.sql_result = 'x' * 10000
+        self.post()
+        stored = ChatMessage.objects.get(message_type='assistant').sql_result
+        self.assertEqual(len(stored), ProcessChatMessageView.max_sql_result_length)
+
+    def test_bounds_history_and_filters(self):
+        session = ChatSession.objects.create(user=self.user, title='Phones')
+        start = timezone.now() - timedelta(hours=1)
+        for i in range(12):
+            message = ChatMessage.objects.create(
+                session=session, message_type='assistant' if i % 2 else 'user', content=f'message {i}',
+                generated_sql=f'SELECT {i}' if i % 2 else '')
+            # auto_now_add would give every message nearly the same timestamp
+            ChatMessage.objects.filter(pk=message.pk).update(created_at=start + timedelta(minutes=i))
+        self.post('Cheaper ones?', chat_id=str(session.pk))
+        messages, system_context = self.llm.calls[0]
+        self.assertEqual([m.content for m in messages],
+                         [f'message {i}' for i in range(2, 12)] + ['Cheaper ones?'])
+        self.assertNotIn('SELECT 5', system_context)
+        self.assertIn('SELECT 7', system_context)
+        self.assertIn('SELECT 11', system_context)
+
+    def test_reuses_cached_answer(self):
+        first = self.post('Which phones?')
+        second = self.post('  which   PHONES? ')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['answer'], first.data['answer'])
+        self.assertEqual(len(self.llm.calls), 1)
+        # Cached turns are still saved to the (new) chat
+        self.assertEqual(ChatMessage.objects.filter(generated_sql__startswith='SELECT').count(), 2)
+
+    def test_redis_unavailable_falls_back_to_llm(self):
+        with (mock.patch('chatapi.views.get_redis_service', return_value=UnavailableRedisService()),
+              self.assertLogs('chatapi.views', 'WARNING')):
+            response = self.post()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['answer'], 'We have iPhone.')
+        self.assertEqual(ChatMessage.objects.count(), 2)
+
+    def assertStreamedEvents(self, response, content):
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        events = [json.loads(line.removeprefix('data: ')) for line in content.decode().split('\n\n') if line]
+        session = ChatSession.objects.get()
+        # Only chatbot tokens are sent; the tool output is not
+        self.assertEqual(events, [
+            {'token': 'We have '},
+            {'token': 'iPhone.'},
+            {'chat_id': str(session.pk), 'answer': 'We have iPhone.', 'created_new_chat': True},
+        ])
+        self.assertEqual(session.messages.count(), 2)
+        self.assertEqual(len(self.redis.cache), 1)
+
+    def test_streams_events(self):
+        response = self.client.post(self.url, {'message': 'Which phones?'}, format='json',
+                                    HTTP_ACCEPT='text/event-stream')
+        self.assertFalse(response.is_async)
+        self.assertStreamedEvents(response, b''.join(response.streaming_content))
+
+    async def test_streams_events_under_asgi(self):
+        credentials = base64.b64encode(b'alice:secret').decode()
+        response = await AsyncClient().post(
+            self.url, {'message': 'Which phones?'}, content_type='application/json',
+            headers={'Accept': 'text/event-stream', 'Authorization': f'Basic {credentials}'},
+        )
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        await sync_to_async(self.assertStreamedEvents)(response, content)
+
+
+class ChatSessionViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice')
+        cls.session = ChatSession.objects.create(user=cls.user, title='Phones')
+        start = timezone.now() - timedelta(days=1)
+        messages = ChatMessage.objects.bulk_create(
+            ChatMessage(session=cls.session, message_type='user', content=f'message {i}') for i in range(205)
+        )
+        for i, message in enumerate(messages):
+            ChatMessage.objects.filter(pk=message.pk).update(created_at=start + timedelta(minutes=i))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_counts_and_last_message(self):
+        response = self.client.get(reverse('chat-list'))
+        [session] = response.data if isinstance(response.data, list) else response.data['results']
+        self.assertEqual(session['messages_count'], 205)
+        self.assertEqual(session['last_message']['content'], 'message 204')
+
+    def test_detail_returns_newest_messages(self):
+        response = self.client.get(reverse('chat-detail', kwargs={'id': self.session.pk}))
+        contents = [m['content'] for m in response.data['messages']]
+        self.assertEqual(len(contents), ChatSessionDetailSerializer.max_messages)
+        self.assertEqual(contents[0], 'message 204')
+        self.assertEqual(contents[-1], 'message 5')
@@ -1,16 +1,25 @@
+import hashlib
 import logging
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Prefetch
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.settings import api_settings
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
-from constance import config 
+from redis import RedisError
 
 from langchain_core.messages import HumanMessage
 
 from .models import ChatSession, ChatMessage
+from .renderers import EventStreamRenderer, format_event
 from .serializers import (
     ChatSessionSerializer,
     ChatSessionDetailSerializer,
@@ -19,10 +28,12 @@ from .serializers import (
     ChatMessageSerializer,
     ChatProcessRequestSerializer,
 )
-from .services.llm_langgraph_tools import (SQLQuerySystemTools, 
+from .services.llm_langgraph_tools import (get_sql_query_system_tools, 
+                                           get_system_prompt_with_filters,
                                            ProcessedMessages, 
                                            convert_queryset_to_langchain,
                                            get_user_filters)
+from .services.redis_service import get_redis_service
                                            
 
 logger = logging.getLogger(__name__)
@@ -36,15 +47,18 @@ class HealthCheckView(APIView):
 
 
 class ProcessChatMessageView(generics.GenericAPIView):
-    """Main endpoint for processing chat messages through LLM system."""
+    """Main endpoint for processing chat messages through LLM system.
+    
+    Clients sending ``Accept: text/event-stream`` get the answer as Server-Sent
+    Events: ``{"token": ...}`` events while the model is generating, then one
+    final event with the same fields as the JSON response.
+    """
     
     serializer_class = ChatProcessRequestSerializer
     permission_classes = [IsAuthenticated]
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.llm_system = SQLQuerySystemTools()
-        self.message_processor = ProcessedMessages()
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer]
+    # Stored SQL results are fed back into later prompts as filters, so keep them bounded
+    max_sql_result_length = 8192
 
     def post(self, request):
         """Process chat message through LLM system with conversation history."""
@@ -61,47 +75,50 @@ class ProcessChatMessageView(generics.GenericAPIView):
             
             # Step 2: Get conversation history if existing chat. limit last 10
             chat_history = self._get_conversation_history(chat_session)
-            conversation_history = convert_queryset_to_langchain(chat_history)[:10]
+            conversation_history = convert_queryset_to_langchain(chat_history, limit=10)
+            logger.debug("Retrieved %d messages for conversation history", len(conversation_history))
 
             # Step 3: Get last user filters if any, limit 3 last
-            user_filters = get_user_filters(chat_history)[:3]
+            user_filters = get_user_filters(chat_history, limit=3)
            
-            # Step 3: Save user message
-            user_message = ChatMessage.objects.create(
-                session=chat_session,
-                message_type='user',
-                content=user_m
-            )
-            
-            # Step 4: Process through LLM system with history
-            messages = conversation_history + [HumanMessage(content=user_m)]
-            system_prompt_filters= config.LLM_SYSTEM_PROMPT_WITH_TOOLS_AND_FILTERS.format(
-                user_filters=user_filters
-            )
-            processed_result = self.llm_system.query_and_process(messages, 
-                                                                 self.message_processor,
-                                                                 custom_system_prompt=system_prompt_filters
-                                                                 )
-            ai_response = processed_result.ai_messages[-1]
-            generated_sql = processed_result.sql_queries[-1] if processed_result.sql_queries else None
-            sql_result = processed_result.tool_messages[-1] if processed_result.tool_messages else None
-
-            # Step 5: Save assistant response
-            assistant_message = ChatMessage.objects.create(
-                session=chat_session,
-                message_type='assistant',
-                content=ai_response,
-                generated_sql=generated_sql or "",
-                sql_result=sql_result or ""
-            )
-
-            # Step 6: Generate title for new chats
-            if created_new_chat and not chat_session.title:
-                self._generate_chat_title(chat_session, user_m)
+            # Step 4: Reuse a cached answer for the same message and recent history
+            cache_key = self._get_cache_key(user, user_m, conversation_history, user_filters)
+            turn = self._get_cached_turn(cache_key)
+
+            # Step 5: Otherwise process through LLM system with history
+            if turn is None:
+                messages = conversation_history + [HumanMessage(content=user_m)]
+                # Static prompt is cached by the provider; the per-chat filters follow it uncached
+                system_prompt, filters_template = get_system_prompt_with_filters()
+                system_context = filters_template.format(user_filters=user_filters)
+                llm_system = get_sql_query_system_tools()
+                if isinstance(request.accepted_renderer, EventStreamRenderer):
+                    # Under ASGI an async generator keeps the LLM wait off the worker threads;
+                    # Django would buffer a sync one there (and an async one under WSGI)
+                    stream_events = (self._astream_chat_events if isinstance(request._request, ASGIRequest)
+                                     else self._stream_chat_events)
+                    response = StreamingHttpResponse(
+                        stream_events(llm_system, chat_session, created_new_chat, user_m,
+                                      messages, system_prompt, system_context, cache_key),
+                        content_type=EventStreamRenderer.media_type
+                    )
+                    response['Cache-Control'] = 'no-cache'
+                    return response
+
+                processed_result = llm_system.query_and_process(messages, 
+                                                                ProcessedMessages(),
+                                                                custom_system_prompt=system_prompt,
+                                                                system_context=system_context
+                                                                )
+                turn = self._build_turn(processed_result)
+                self._set_cached_turn(cache_key, turn)
+
+            # Step 6: Save the turn
+            self._save_chat_turn(chat_session, created_new_chat, user_m, turn)
 
             return Response({
                 'chat_id': chat_session.id,
-                'answer': processed_result.ai_messages[-1],
+                'answer': turn['answer'],
                 'created_new_chat': created_new_chat,
             })
             
@@ -110,10 +127,125 @@ class ProcessChatMessageView(generics.GenericAPIView):
                 'error': str(e)
             }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Error processing chat message: {e}")
+            logger.error("Error processing chat message: %s", e)
             return Response({
                 'error': f'Error processing message: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def _stream_chat_events(self, llm_system, chat_session, created_new_chat, user_m, messages,
+                            system_prompt, system_context, cache_key):
+        """Yield LLM tokens as SSE events, then save the turn and send the final answer."""
+        try:
+            final_state = None
+            for mode, chunk in llm_system.stream(messages, custom_system_prompt=system_prompt,
+                                                 system_context=system_context):
+                if mode == 'values':
+                    final_state = chunk
+                elif event := self._token_event(chunk):
+                    yield event
+            yield self._finish_stream(chat_session, created_new_chat, user_m, final_state, cache_key)
+        except Exception as e:
+            logger.error("Error streaming chat message: %s", e)
+            yield format_event({'error': f'Error processing message: {str(e)}'})
+
+    async def _astream_chat_events(self, llm_system, chat_session, created_new_chat, user_m, messages,
+                                   system_prompt, system_context, cache_key):
+        """Async version of _stream_chat_events for ASGI servers."""
+        try:
+            final_state = None
+            async for mode, chunk in llm_system.astream(messages, custom_system_prompt=system_prompt,
+                                                        system_context=system_context):
+                if mode == 'values':
+                    final_state = chunk
+                elif event := self._token_event(chunk):
+                    yield event
+            yield await sync_to_async(self._finish_stream)(chat_session, created_new_chat, user_m,
+                                                           final_state, cache_key)
+        except Exception as e:
+            logger.error("Error streaming chat message: %s", e)
+            yield format_event({'error': f'Error processing message: {str(e)}'})
+
+    def _token_event(self, chunk):
+        """Format a "messages" stream chunk from the chatbot node as a token event."""
+        message_chunk, metadata = chunk
+        if metadata.get('langgraph_node') == 'chatbot':
+            token = message_chunk.text()
+            if token:
+                return format_event({'token': token})
+        return None
+
+    def _finish_stream(self, chat_session, created_new_chat, user_m, final_state, cache_key):
+        """Cache and save a streamed turn, returning the final SSE event."""
+        turn = self._build_turn(ProcessedMessages().process_messages(final_state))
+        self._set_cached_turn(cache_key, turn)
+        self._save_chat_turn(chat_session, created_new_chat, user_m, turn)
+        return format_event({
+            'chat_id': chat_session.id,
+            'answer': turn['answer'],
+            'created_new_chat': created_new_chat,
+        })
+
+    def _get_cache_key(self, user, user_m, conversation_history, user_filters):
+        """Hash the user, the normalized message, the last 6 history messages and the filters.
+        
+        The filters (earlier SQL queries and results) are part of the prompt,
+        so answers are only shared between identical contexts of one user.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{user.pk}|".encode())
+        digest.update(' '.join(user_m.split()).casefold().encode())
+        for message in conversation_history[-6:]:
+            digest.update(b"\x00" + str(message.content).encode())
+        digest.update(b"\x01" + str(user_filters).encode())
+        return digest.hexdigest()
+
+    def _get_cached_turn(self, cache_key):
+        """Get a cached turn; Redis being unavailable counts as a miss."""
+        try:
+            return get_redis_service().get_cached_response(cache_key)
+        except RedisError as e:
+            logger.warning("Response cache unavailable: %s", e)
+            return None
+
+    def _set_cached_turn(self, cache_key, turn):
+        """Cache a turn for 5 minutes, ignoring Redis errors."""
+        try:
+            get_redis_service().set_cached_response(cache_key, turn, ttl=300)
+        except RedisError as e:
+            logger.warning("Response cache unavailable: %s", e)
+
+    def _build_turn(self, processed_result):
+        """Extract the answer and the last SQL query/result of an LLM run."""
+        return {
+            'answer': processed_result.ai_messages[-1],
+            'generated_sql': processed_result.sql_queries[-1] if processed_result.sql_queries else "",
+            'sql_result': (processed_result.tool_messages[-1][:self.max_sql_result_length]
+                           if processed_result.tool_messages else ""),
+        }
+
+    def _save_chat_turn(self, chat_session, created_new_chat, user_m, turn):
+        """Persist the user message and assistant response, and title new chats."""
+        # Save user message and assistant response in one transaction
+        with transaction.atomic():
+            ChatMessage.objects.bulk_create([
+                ChatMessage(
+                    session=chat_session,
+                    message_type='user',
+                    content=user_m
+                ),
+                ChatMessage(
+                    session=chat_session,
+                    message_type='assistant',
+                    content=turn['answer'],
+                    generated_sql=turn['generated_sql'],
+                    sql_result=turn['sql_result']
+                ),
+            ])
+            session_fields = {'updated_at': timezone.now()}
+            # Title new chats in the same UPDATE
+            if created_new_chat and not chat_session.title:
+                session_fields['title'] = chat_session.title = self._generate_chat_title(user_m)
+            ChatSession.objects.filter(pk=chat_session.pk).update(**session_fields)
     
     def _get_or_create_chat_session(self, chat_id, user):
         """Get existing chat session or create new one."""
@@ -128,17 +260,12 @@ class ProcessChatMessageView(generics.GenericAPIView):
             return chat_session, True
 
     def _get_conversation_history(self, chat_session):
-        """Get formatted conversation history for LLM context."""
-        # Get all messages for this session, ordered chronologically (oldest first)
-        messages = chat_session.messages.all().order_by('created_at')
-        logger.info(f"Retrieved {len(messages)} messages for conversation history")
-        return messages
+        """Get the messages of a session; callers bound and order them in the database."""
+        return chat_session.messages.all()
 
-    def _generate_chat_title(self, chat_session, first_message):
+    def _generate_chat_title(self, first_message):
         """Generate a title for new chat sessions."""
-        title = first_message[:50] + "..." if len(first_message) > 50 else first_message
-        chat_session.title = title
-        chat_session.save(update_fields=['title'])
+        return first_message[:50] + "..." if len(first_message) > 50 else first_message
 
 
 @extend_schema(
@@ -152,7 +279,15 @@ class ChatSessionListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return ChatSession.objects.filter(user=self.request.user)
+        return ChatSession.objects.filter(user=self.request.user).order_by('-updated_at').annotate(
+            _messages_count=Count('messages')
+        ).prefetch_related(
+            Prefetch(
+                'messages',
+                queryset=ChatMessage.objects.order_by('-created_at')[:1],
+                to_attr='_prefetched_last'
+            )
+        )
 
 
 @extend_schema(
@@ -175,7 +310,7 @@ class ChatSessionDetailView(generics.RetrieveAPIView):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return ChatSession.objects.filter(user=self.request.user).prefetch_related('messages')
+        return ChatSession.objects.filter(user=self.request.user)
 
 
 @extend_schema(
@@ -233,6 +368,7 @@ class AddMessageToChatView(generics.CreateAPIView):
         )
 
         message = serializer.save(session=chat_session, message_type='user')
+        ChatSession.objects.filter(pk=chat_session.pk).update(updated_at=timezone.now())
         return Response({
             'message': 'Message added successfully',
             'data': ChatMessageSerializer(message).data
@@ -262,6 +398,13 @@ class UpdateChatTitleView(generics.UpdateAPIView):
     def get_queryset(self):
         return ChatSession.objects.filter(user=self.request.user)
 
+    def perform_update(self, serializer):
+        """Write only the submitted fields in one UPDATE instead of a full save()."""
+        fields = {**serializer.validated_data, 'updated_at': timezone.now()}
+        ChatSession.objects.filter(pk=serializer.instance.pk).update(**fields)
+        for attr, value in fields.items():
+            setattr(serializer.instance, attr, value)
+
 
 @extend_schema(
     summary="Delete chat session",
@@ -3,11 +3,12 @@ import os
 from dotenv import load_dotenv
 from chatapi.services import llm_prompt_example as prompt
 
-load_dotenv()
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Explicit path: skips find_dotenv's directory walk on every process start
+load_dotenv(BASE_DIR / '.env')
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -77,6 +78,23 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Wait for the writer lock instead of failing with "database is locked".
+        # WAL lets reads run alongside the single writer; it is stored in the
+        # database file (db.sqlite3 is committed in WAL mode), the rest is per connection
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        },
+        # Persistent connections are for WSGI servers only: under ASGI every request
+        # runs in a new thread and kept-alive connections leak, so leave this at 0
+        # there (runserver in the Docker setup is WSGI)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -136,6 +154,8 @@ REST_FRAMEWORK = {
 # Redis Configuration
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+# Payload format for RedisService: 'orjson' or 'json'
+REDIS_SERIALIZER = os.getenv('REDIS_SERIALIZER', 'orjson')
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
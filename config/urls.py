@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.urls import path, include
+from django.views.decorators.cache import cache_page
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -10,7 +11,8 @@ from drf_spectacular.views import (
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('chatapi.urls')),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    # Schema generation walks every view and serializer; it only changes on deploy
+    path('api/schema/', cache_page(60 * 60)(SpectacularAPIView.as_view()), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
@@ -1,10 +1,29 @@
+from functools import lru_cache
 from django.contrib import admin
-from django.utils.html import format_html
-from django.urls import reverse
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Count, Q
+from django.utils.html import format_html_join
 from django.utils.safestring import mark_safe
+from django.urls import reverse
 from .models import Product, Category, Brand
 
 
+@lru_cache(maxsize=1)
+def _product_changelist_url():
+    """Resolve the product changelist URL once; URLconf isn't loaded at import time."""
+    return reverse('admin:products_product_changelist')
+
+
+# Plain %-templates instead of format_html: every substituted value is an int
+# or the reversed admin URL, so there is nothing to escape.
+_BRAND_LINK_TMPL = '<a href="%s?brand__id__exact=%d">%d products</a>'
+_CATEGORY_LINK_TMPL = '<a href="%s?category__id__exact=%d">%d products</a>'
+
+_TAG_STYLE = 'background-color: #e1f5fe; padding: 2px 6px; margin: 2px; border-radius: 3px; font-size: 11px;'
+_TAG_TMPL = '<span style="' + _TAG_STYLE + '">{}</span>'
+_NO_TAGS = mark_safe('No tags')
+
+
 @admin.register(Brand)
 class BrandAdmin(admin.ModelAdmin):
     list_display = ['name', 'website', 'product_count', 'is_active']
@@ -32,21 +51,31 @@ class BrandAdmin(admin.ModelAdmin):
     
     def product_count(self, obj):
         """Display number of products for this brand"""
-        count = obj.products.count()
+        count = obj._product_count
         if count > 0:
-            url = reverse('admin:products_product_changelist') + f'?brand__id__exact={obj.id}'
-            return format_html('<a href="{}">{} products</a>', url, count)
+            return mark_safe(_BRAND_LINK_TMPL % (_product_changelist_url(), obj.id, count))
         return '0 products'
     product_count.short_description = 'Products'
+    product_count.admin_order_field = '_product_count'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related('products')
+        return super().get_queryset(request).annotate(_product_count=Count('products'))
+
+    actions = ['deactivate_with_products']
+
+    def deactivate_with_products(self, request, queryset):
+        # Products are PROTECTed from deletion; retire the whole brand in two UPDATEs instead
+        products_updated = Product.objects.filter(brand__in=queryset.values('pk')).update(is_active=False)
+        updated = queryset.update(is_active=False)
+        self.message_user(request, f'{updated} brands and {products_updated} products marked as inactive.')
+    deactivate_with_products.short_description = "Deactivate selected brands and their products"
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'parent', 'product_count', 'is_active']
     list_filter = ['is_active', 'parent']
+    list_select_related = ['parent']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ['product_count']
@@ -69,15 +98,30 @@ class CategoryAdmin(admin.ModelAdmin):
     
     def product_count(self, obj):
         """Display number of products in this category"""
-        count = obj.products.count()
+        count = obj._product_count
         if count > 0:
-            url = reverse('admin:products_product_changelist') + f'?category__id__exact={obj.id}'
-            return format_html('<a href="{}">{} products</a>', url, count)
+            return mark_safe(_CATEGORY_LINK_TMPL % (_product_changelist_url(), obj.id, count))
         return '0 products'
     product_count.short_description = 'Products'
+    product_count.admin_order_field = '_product_count'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related('products')
+        return super().get_queryset(request).annotate(_product_count=Count('products'))
+
+    actions = ['deactivate_with_products']
+
+    def deactivate_with_products(self, request, queryset):
+        # Products are PROTECTed from deletion; retire the whole category in two UPDATEs instead
+        products_updated = Product.objects.filter(category__in=queryset.values('pk')).update(is_active=False)
+        updated = queryset.update(is_active=False)
+        self.message_user(request, f'{updated} categories and {products_updated} products marked as inactive.')
+    deactivate_with_products.short_description = "Deactivate selected categories and their products"
+
+
+class ProductChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # description and tags aren't list columns; search still filters on them in SQL
+        return super().get_queryset(request, exclude_parameters).list_fields()
 
 
 @admin.register(Product)
@@ -92,7 +136,7 @@ class ProductAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description', 'sku', 'brand__name']
     list_editable = ['price', 'stock', 'is_active']
     readonly_fields = ['created_at', 'updated_at', 'formatted_tags']
-    ordering = ['-created_at']
+    ordering = ['-id']  # newest first via the primary key; ids follow insertion order
     
     fieldsets = (
         ('Basic Information', {
@@ -126,13 +170,16 @@ class ProductAdmin(admin.ModelAdmin):
                 ('out_of_stock', 'Out of Stock'),
             )
         
+        value_filters = {
+            'in_stock': Q(stock__gt=0),
+            'low_stock': Q(stock__gt=0, stock__lt=10),
+            'out_of_stock': Q(stock=0),
+        }
+        
         def queryset(self, request, queryset):
-            if self.value() == 'in_stock':
-                return queryset.filter(stock__gt=0)
-            if self.value() == 'low_stock':
-                return queryset.filter(stock__gt=0, stock__lt=10)
-            if self.value() == 'out_of_stock':
-                return queryset.filter(stock=0)
+            value_filter = self.value_filters.get(self.value())
+            if value_filter is not None:
+                return queryset.filter(value_filter)
     
     class RatingFilter(admin.SimpleListFilter):
         title = 'rating level'
@@ -147,17 +194,18 @@ class ProductAdmin(admin.ModelAdmin):
                 ('unrated', 'No Rating'),
             )
         
+        value_filters = {
+            'excellent': Q(rating__gte=4.5),
+            'good': Q(rating__gte=3.5, rating__lt=4.5),
+            'average': Q(rating__gte=2.5, rating__lt=3.5),
+            'poor': Q(rating__gt=0, rating__lt=2.5),
+            'unrated': Q(rating=0),
+        }
+        
         def queryset(self, request, queryset):
-            if self.value() == 'excellent':
-                return queryset.filter(rating__gte=4.5)
-            if self.value() == 'good':
-                return queryset.filter(rating__gte=3.5, rating__lt=4.5)
-            if self.value() == 'average':
-                return queryset.filter(rating__gte=2.5, rating__lt=3.5)
-            if self.value() == 'poor':
-                return queryset.filter(rating__gt=0, rating__lt=2.5)
-            if self.value() == 'unrated':
-                return queryset.filter(rating=0)
+            value_filter = self.value_filters.get(self.value())
+            if value_filter is not None:
+                return queryset.filter(value_filter)
     
     list_filter = [
         'is_active', 'brand', 'category', 'created_at', 
@@ -166,16 +214,13 @@ class ProductAdmin(admin.ModelAdmin):
     
     def formatted_tags(self, obj):
         """Display tags in a readable format"""
-        if obj.tags:
-            tags_html = ""
-            for tag in obj.tags:
-                tags_html += f'<span style="background-color: #e1f5fe; padding: 2px 6px; margin: 2px; border-radius: 3px; font-size: 11px;">{tag}</span>'
-            return mark_safe(tags_html)
-        return "No tags"
+        if not obj.tags:
+            return _NO_TAGS
+        return format_html_join('', _TAG_TMPL, ((tag,) for tag in obj.tags))
     formatted_tags.short_description = 'Tags (Display)'
     
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('brand', 'category')
+    def get_changelist(self, request, **kwargs):
+        return ProductChangeList
     
     # Add custom actions
     actions = ['mark_as_active', 'mark_as_inactive', 'reset_stock']
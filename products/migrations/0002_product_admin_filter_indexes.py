@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_active', '-created_at'], name='products_pr_is_acti_645007_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['brand', 'category'], name='products_pr_brand_i_98ddd0_idx'),
+        ),
+    ]
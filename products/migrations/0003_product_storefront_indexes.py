@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:25
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='name',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='price',
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='rating',
+            field=models.FloatField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(5)]),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'is_active', '-rating'], name='products_pr_categor_bd83e2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'is_active', 'price'], name='products_pr_categor_db026f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['brand', 'is_active', '-created_at'], name='products_pr_brand_i_79736e_idx'),
+        ),
+    ]
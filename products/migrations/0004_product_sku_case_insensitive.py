@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:26
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_storefront_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('sku'), name='uniq_product_sku_ci'),
+        ),
+    ]
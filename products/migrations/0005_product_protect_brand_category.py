@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_sku_case_insensitive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='brand',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='products', to='products.brand'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='products', to='products.category'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:29
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_protect_brand_category'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='product',
+            name='uniq_product_sku_ci',
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='sku',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(condition=models.Q(('sku', ''), _negated=True), fields=('sku',), name='uniq_product_sku_nonblank', violation_error_message='A product with this SKU already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('sku'), condition=models.Q(('sku', ''), _negated=True), name='uniq_product_sku_ci', violation_error_message='A product with this SKU already exists.'),
+        ),
+    ]
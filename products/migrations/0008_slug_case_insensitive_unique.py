@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_product_rating_price_checks'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='brand',
+            name='slug',
+            field=models.SlugField(db_index=False),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(db_index=False),
+        ),
+        migrations.AddConstraint(
+            model_name='brand',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('slug'), name='uniq_brand_slug_ci', violation_error_message='A brand with this slug already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('slug'), name='uniq_category_slug_ci', violation_error_message='A category with this slug already exists.'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:31
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_slug_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_product_created_at_db_default'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='products_pr_created_bce1a7_idx',
+        ),
+    ]
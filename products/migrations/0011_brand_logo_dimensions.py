@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_drop_product_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='brand',
+            name='logo_height',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='brand',
+            name='logo_width',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='brand',
+            name='logo',
+            field=models.ImageField(blank=True, height_field='logo_height', null=True, upload_to='brands/', width_field='logo_width'),
+        ),
+    ]
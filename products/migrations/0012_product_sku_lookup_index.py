@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_brand_logo_dimensions'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='product',
+            name='uniq_product_sku_nonblank',
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['sku'], name='products_pr_sku_ca0cdc_idx'),
+        ),
+    ]
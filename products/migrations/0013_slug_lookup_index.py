@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_product_sku_lookup_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='brand',
+            name='slug',
+            field=models.SlugField(),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(),
+        ),
+    ]
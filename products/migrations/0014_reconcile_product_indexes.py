@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-15 20:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_slug_lookup_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='products_pr_is_acti_645007_idx',
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='brand',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='products', to='products.brand'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='products', to='products.category'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.core.files.images import get_image_dimensions
+from django.db import migrations
+
+
+def backfill_logo_dimensions(apps, schema_editor):
+    """Fill logo_width/logo_height for existing logos and clear logos whose file is gone.
+
+    With width_field/height_field set, ImageField reads the image on every
+    instantiation while the dimensions are NULL (and raises if the file is
+    missing), so no row may be left in that state. Rows are read with
+    values_list() for the same reason.
+    """
+    Brand = apps.get_model('products', 'Brand')
+    storage = Brand._meta.get_field('logo').storage
+    brands = (
+        Brand.objects
+        .exclude(logo__isnull=True).exclude(logo='')
+        .filter(logo_width__isnull=True)
+        .values_list('pk', 'logo')
+    )
+    for pk, name in brands.iterator():
+        try:
+            with storage.open(name) as logo:
+                width, height = get_image_dimensions(logo)
+        except FileNotFoundError:
+            Brand.objects.filter(pk=pk).update(logo='')
+        else:
+            Brand.objects.filter(pk=pk).update(logo_width=width, logo_height=height)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_reconcile_product_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_logo_dimensions, migrations.RunPython.noop),
+    ]
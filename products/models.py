@@ -1,41 +1,94 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Lower, Now, Upper
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
+class ProductQuerySet(models.QuerySet):
+    def list_fields(self):
+        # description and tags are only shown on the detail/change page
+        return self.defer('description', 'tags')
+
+
+class ProductManager(models.Manager.from_queryset(ProductQuerySet)):
+    def get_queryset(self):
+        # Product.__str__ and every product listing touch the brand and category
+        return super().get_queryset().select_related('brand', 'category')
+
+
 class Product(models.Model):
-    name = models.CharField(max_length=200, db_index=True)  # Add index for search
-    brand = models.ForeignKey('Brand', on_delete=models.CASCADE, related_name='products')
-    category = models.ForeignKey('Category', on_delete=models.CASCADE, related_name='products')
-    price = models.DecimalField(max_digits=10, decimal_places=2, db_index=True)
+    name = models.CharField(max_length=200)
+    # No single-column FK indexes: the composite indexes below lead with brand/category
+    brand = models.ForeignKey('Brand', on_delete=models.PROTECT, related_name='products', db_index=False)
+    category = models.ForeignKey('Category', on_delete=models.PROTECT, related_name='products', db_index=False)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(default=0)
-    rating = models.FloatField(default=0, db_index=True, validators=[MinValueValidator(0), MaxValueValidator(5)])
+    rating = models.FloatField(default=0, validators=[MinValueValidator(0), MaxValueValidator(5)])
     tags = models.JSONField(default=list, blank=True)
     description = models.TextField(blank=True)
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)  # stamped by the INSERT
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
-    sku = models.CharField(max_length=100, unique=True, blank=True)
+    sku = models.CharField(max_length=100, blank=True, default='')
+
+    objects = ProductManager()
+    raw_objects = models.Manager()  # without the joins
     
     class Meta:
         indexes = [
+            # The admin changelist (-id, with or without the is_active filter)
+            # walks the primary key and needs no index of its own.
+            # name = lookups
             models.Index(fields=['name', 'brand']),
-            models.Index(fields=['-created_at']),
+            # Admin brand (+ category) filters and brand PROTECT checks
+            models.Index(fields=['brand', 'category']),
+            # Storefront/LLM queries: active products in a category or brand,
+            # ranged on price or ordered by rating/recency; the category ones
+            # also serve category filters and PROTECT checks
+            models.Index(fields=['category', 'is_active', '-rating']),
+            models.Index(fields=['category', 'is_active', 'price']),
+            models.Index(fields=['brand', 'is_active', '-created_at']),
+            # Plain sku = / IN lookups; the partial unique index below can't serve them
+            models.Index(fields=['sku']),
+        ]
+        constraints = [
+            # Blank SKUs (drafts) may repeat; "abc-1" and "ABC-1" are the same SKU
+            models.UniqueConstraint(
+                Upper('sku'), condition=~Q(sku=''), name='uniq_product_sku_ci',
+                violation_error_message='A product with this SKU already exists.',
+            ),
+            # Enforced for bulk_create()/update() too, which skip the field validators
+            models.CheckConstraint(condition=Q(rating__gte=0, rating__lte=5), name='product_rating_range'),
+            models.CheckConstraint(condition=Q(price__gte=0), name='product_price_nonneg'),
         ]
     
     def __str__(self):
         return f"{self.brand} {self.name}"
 
+    @classmethod
+    def decrement_stock(cls, pk, qty):
+        """Take qty units in a single UPDATE; returns False if there isn't enough stock."""
+        if qty <= 0:
+            raise ValueError(f'qty must be positive, got {qty}')
+        return cls.objects.filter(pk=pk, stock__gte=qty).update(stock=F('stock') - qty) == 1
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
-    slug = models.SlugField(unique=True)
+    slug = models.SlugField()  # indexed for exact lookups; unique ignoring case via Meta.constraints
     description = models.TextField(blank=True)
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True)  # For subcategories
     is_active = models.BooleanField(default=True)
     
     class Meta:
         verbose_name_plural = "categories"
+        constraints = [
+            models.UniqueConstraint(
+                Lower('slug'), name='uniq_category_slug_ci',
+                violation_error_message='A category with this slug already exists.',
+            ),
+        ]
     
     def __str__(self):
         return self.name
@@ -43,11 +96,23 @@ class Category(models.Model):
 
 class Brand(models.Model):
     name = models.CharField(max_length=100, unique=True)
-    slug = models.SlugField(unique=True)
+    slug = models.SlugField()  # indexed for exact lookups; unique ignoring case via Meta.constraints
     description = models.TextField(blank=True)
-    logo = models.ImageField(upload_to='brands/', blank=True, null=True)
+    # Dimensions are stored on upload so reading logo.width/height doesn't open the file
+    logo = models.ImageField(upload_to='brands/', blank=True, null=True,
+                             width_field='logo_width', height_field='logo_height')
+    logo_width = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    logo_height = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
     website = models.URLField(blank=True)
     is_active = models.BooleanField(default=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower('slug'), name='uniq_brand_slug_ci',
+                violation_error_message='A brand with this slug already exists.',
+            ),
+        ]
     
     def __str__(self):
         return self.name
\ No newline at end of file
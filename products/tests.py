@@ -1,3 +1,148 @@
-from django.test import TestCase
+import importlib
+import io
+import tempfile
+from unittest import skipUnless
 
-# Create your tests here.
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Lower
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .models import Brand, Category, Product
+
+
+class ProductTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name='Apple', slug='apple')
+        cls.category = Category.objects.create(name='Electronics', slug='electronics')
+
+    def create_product(self, **kwargs):
+        fields = {'name': 'iPhone', 'brand': self.brand, 'category': self.category, 'price': 999}
+        fields.update(kwargs)
+        return Product.objects.create(**fields)
+
+
+class ProductSkuTests(ProductTestCase):
+    def test_blank_skus_can_repeat(self):
+        self.create_product(name='Draft 1')
+        self.create_product(name='Draft 2')
+        self.assertEqual(Product.objects.filter(sku='').count(), 2)
+
+    def test_sku_unique_ignoring_case(self):
+        self.create_product(sku='APL-IPH-001')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.create_product(name='Copy', sku='apl-iph-001')
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite query plan')
+    def test_sku_lookup_uses_index(self):
+        plan = Product.objects.filter(sku__in=['APL-IPH-001']).explain()
+        self.assertIn('USING INDEX', plan)
+
+
+class SlugTests(ProductTestCase):
+    def test_slug_unique_ignoring_case(self):
+        for model in (Brand, Category):
+            with self.subTest(model=model.__name__), self.assertRaises(IntegrityError), transaction.atomic():
+                model.objects.create(name='Other', slug=model.objects.get().slug.upper())
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite query plan')
+    def test_slug_lookup_uses_index(self):
+        for model in (Brand, Category):
+            with self.subTest(model=model.__name__):
+                self.assertIn('USING INDEX', model.objects.filter(slug__in=['apple']).explain())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class BrandLogoBackfillTests(ProductTestCase):
+    migration = importlib.import_module('products.migrations.0015_backfill_brand_logo_dimensions')
+
+    def test_fills_dimensions_and_clears_missing_logos(self):
+        image = io.BytesIO()
+        Image.new('RGB', (120, 40)).save(image, 'PNG')
+        name = default_storage.save('brands/apple.png', ContentFile(image.getvalue()))
+        missing = Brand.objects.create(name='Gone', slug='gone')
+        # update() skips ImageField's post_init, which would read the files
+        Brand.objects.filter(pk=self.brand.pk).update(logo=name)
+        Brand.objects.filter(pk=missing.pk).update(logo='brands/gone.png')
+
+        self.migration.backfill_logo_dimensions(apps, connection.schema_editor())
+
+        self.assertCountEqual(Brand.objects.values_list('logo', 'logo_width', 'logo_height'), [
+            (name, 120, 40),
+            ('', None, None),
+        ])
+
+
+class SeedProductsTests(ProductTestCase):
+    def seed(self):
+        call_command('seed_products', stdout=io.StringIO())
+
+    def test_reuses_case_variant_slugs(self):
+        Brand.objects.filter(pk=self.brand.pk).update(slug='APPLE')
+        self.seed()
+        self.assertEqual(Brand.objects.filter(name='Apple').get().pk, self.brand.pk)
+        self.assertTrue(self.brand.products.exists())
+
+    def test_skips_case_variant_skus(self):
+        self.seed()
+        Product.raw_objects.update(sku=Lower('sku'))
+        out = io.StringIO()
+        call_command('seed_products', stdout=out)
+        self.assertNotIn('Created product', out.getvalue())
+        self.assertIn('- Products: 0', out.getvalue())
+
+
+class DecrementStockTests(ProductTestCase):
+    def setUp(self):
+        self.product = self.create_product(stock=5)
+
+    def test_decrements_when_enough_stock(self):
+        self.assertTrue(Product.decrement_stock(self.product.pk, 5))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 0)
+
+    def test_insufficient_stock_leaves_row_unchanged(self):
+        self.assertFalse(Product.decrement_stock(self.product.pk, 6))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 5)
+
+    def test_rejects_non_positive_qty(self):
+        for qty in (0, -1):
+            with self.subTest(qty=qty), self.assertRaises(ValueError):
+                Product.decrement_stock(self.product.pk, qty)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 5)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite query plans')
+class ProductIndexTests(ProductTestCase):
+    def assertIndexed(self, queryset):
+        plan = queryset.explain()
+        self.assertIn('USING', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def assertSqlIndexed(self, where):
+        # The LLM writes is_active = 1 rather than the ORM's bare boolean
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN SELECT id FROM products_product WHERE {where}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('USING', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_changelist_queries(self):
+        # Newest first walks the primary key without sorting
+        for queryset in (Product.raw_objects.all(), Product.raw_objects.filter(is_active=True)):
+            self.assertNotIn('TEMP B-TREE', queryset.order_by('-id')[:100].explain())
+        self.assertIndexed(Product.raw_objects.filter(brand=self.brand))
+        self.assertIndexed(Product.raw_objects.filter(category=self.category))
+        self.assertIndexed(Product.raw_objects.filter(brand=self.brand, category=self.category))
+
+    def test_storefront_queries_use_indexes(self):
+        self.assertSqlIndexed('category_id = 1 AND is_active = 1 ORDER BY rating DESC')
+        self.assertSqlIndexed('category_id = 1 AND is_active = 1 AND price <= 100')
+        self.assertSqlIndexed('brand_id = 1 AND is_active = 1 ORDER BY created_at DESC')